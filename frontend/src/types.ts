@@ -2,6 +2,9 @@ export interface Anime {
   id: string
   title: string
   description: string
+  base_locale?: string
+  // Text for locales other than base_locale; the base text is title/description
+  localized?: Record<string, { title: string; description: string }>
   rating?: {
     average: string
     total: number
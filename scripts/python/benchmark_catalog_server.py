@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Load-test the local catalog query server.
+Replays a mix of realistic queries and reports p50/p99 latency and throughput.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import requests
+
+from catalog_server import MAX_PER_PAGE, CatalogService, create_server, tokenize
+
+
+def build_query_mix(facets: Dict, words: List[str], count: int, seed: int = 42) -> List[Dict]:
+    """Generate search/filter queries drawn from the values actually in the catalog."""
+    rng = random.Random(seed)
+
+    queries = []
+    for _ in range(count):
+        filter_state = {}
+        facet = rng.choice(['genres', 'genres', 'genres', 'tags', 'tags', 'studios', None, None, None, None])
+        if facet and facets[facet]:
+            state = rng.choice(['include', 'exclude']) if facet == 'tags' else 'include'
+            filter_state[facet] = {rng.choice(list(facets[facet])): state}
+        if rng.random() < 0.3:
+            filter_state[rng.choice(['mature', 'dubbed', 'subbed'])] = rng.choice(['include', 'exclude'])
+        if rng.random() < 0.2:
+            filter_state['minRating'] = rng.choice([1, 2, 3, 4])
+
+        search = rng.choice(words) if words and rng.random() < 0.4 else ''
+        queries.append({
+            'search': search,
+            'filter': filter_state,
+            'page': rng.choice([1, 1, 1, 2, 3]),
+            'per_page': rng.choice([16, 32]),
+        })
+
+    return queries
+
+
+def fetch_remote_catalog_sample(base_url: str) -> Tuple[Dict, List[str]]:
+    """Read facet values and search words from an already running server."""
+    facets = requests.get(f"{base_url}/api/facets", timeout=30).json()
+    page = requests.get(f"{base_url}/api/search", params={'per_page': MAX_PER_PAGE}, timeout=30).json()
+    words = sorted({
+        word for item in page['results']
+        for word in tokenize(f"{item.get('title', '')} {item.get('description', '')}")
+        if len(word) >= 4
+    })
+    return facets, words
+
+
+def get_cache_stats(base_url: str) -> Dict:
+    """Read the server's cumulative cache counters."""
+    return requests.get(f"{base_url}/api/health", timeout=30).json()['cache']
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run_load(base_url: str, queries: List[Dict], concurrency: int) -> Dict:
+    """Send every query through a pool of concurrent clients and time each one."""
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(query: Dict):
+        nonlocal errors
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+
+        start = time.perf_counter()
+        try:
+            response = local.session.get(
+                f"{base_url}/api/search",
+                params={
+                    'search': query['search'],
+                    'filter': json.dumps(query['filter']),
+                    'page': query['page'],
+                    'per_page': query['per_page'],
+                },
+                timeout=30
+            )
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, queries))
+    wall_time = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        'requests': len(queries),
+        'errors': errors,
+        'wall_time_s': round(wall_time, 3),
+        'throughput_rps': round(len(latencies) / wall_time, 1) if wall_time else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+def print_report(label: str, report: Dict):
+    """Print one benchmark phase."""
+    print(f"\n{label}")
+    print(f"  Requests:   {report['requests']} ({report['errors']} errors)")
+    print(f"  Throughput: {report['throughput_rps']} req/s")
+    print(f"  p50:        {report['p50_ms']} ms")
+    print(f"  p99:        {report['p99_ms']} ms")
+    print(f"  Mean:       {report['mean_ms']} ms")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description='Benchmark the catalog query server.')
+    parser.add_argument('--catalog', default='frontend/public/anime.json', help='Path to anime.json')
+    parser.add_argument('--url', help='Benchmark an already running catalog_server.py, '
+                                      'e.g. http://127.0.0.1:8765 (recommended for real numbers)')
+    parser.add_argument('--requests', type=int, default=2000, help='Number of requests per phase')
+    parser.add_argument('--unique', type=int, default=200,
+                        help='Number of distinct queries (repeats exercise the result cache)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--cache-size', type=int, default=512)
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the generated query mix')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("CATALOG QUERY SERVER BENCHMARK")
+    print("="*60)
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+        facets, words = fetch_remote_catalog_sample(base_url)
+        print(f"Benchmarking running server at {base_url}")
+    else:
+        # In-process server shares the GIL with the load generator; use --url for real numbers
+        service = CatalogService(args.catalog, cache_size=args.cache_size)
+        server = create_server(service, '127.0.0.1', 0)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        facets = service.index.facet_counts()
+        words = [word for word in service.index.vocabulary if len(word) >= 4]
+        print(f"Indexed {len(service.index.items)} entries, serving in-process on {base_url}")
+        print("WARNING: client and server share one process; latencies include client contention")
+
+    unique_queries = build_query_mix(facets, words, args.unique, args.seed)
+    rng = random.Random(args.seed + 1)
+    workload = [rng.choice(unique_queries) for _ in range(args.requests)]
+
+    try:
+        before = get_cache_stats(base_url)
+
+        # Cold phase: every distinct query once. A running server may already
+        # have cached some of them; pass a new --seed to get a fresh query mix.
+        print_report("Cold (first sight of each query)", run_load(base_url, unique_queries, args.concurrency))
+
+        # Warm phase: repeated queries served mostly from the LRU
+        print_report("Warm (repeated queries)", run_load(base_url, workload, args.concurrency))
+
+        after = get_cache_stats(base_url)
+        hits = after['hits'] - before['hits']
+        misses = after['misses'] - before['misses']
+        hit_rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+        print(f"\nCache: {hits} hits, {misses} misses ({hit_rate:.1f}% hit rate)")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    print("="*60)
+
+
+if __name__ == '__main__':
+    main()
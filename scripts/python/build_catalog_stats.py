@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Build catalog analytics from anime.json.
+Loads the enriched catalog into columnar NumPy arrays and computes facet
+frequencies, rating/score distributions, per-studio and per-season counts and
+dub/sub coverage by year as one publishable stats artifact.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from catalog_server import get_rating
+
+
+SEASONS = ['WINTER', 'SPRING', 'SUMMER', 'FALL']
+
+# Crunchyroll star ratings and AniList scores are bucketed into fixed bins
+RATING_BINS = np.arange(1.0, 5.5, 0.5)
+SCORE_BINS = np.arange(0, 110, 10)
+
+
+class CatalogColumns:
+    """Column-oriented view of the catalog, one array entry per series."""
+
+    def __init__(self, anime_data: List[Dict]):
+        self.size = len(anime_data)
+
+        metadata = [item.get('series_metadata') or {} for item in anime_data]
+        anilist = [item.get('anilist') or {} for item in anime_data]
+
+        self.rating = np.array([get_rating(item, np.nan) for item in anime_data], dtype=np.float64)
+        self.launch_year = self._numeric(metadata, 'series_launch_year')
+        self.is_dubbed = np.array([bool(m.get('is_dubbed')) for m in metadata])
+        self.is_subbed = np.array([bool(m.get('is_subbed')) for m in metadata])
+        self.is_mature = np.array([bool(m.get('is_mature')) for m in metadata])
+
+        self.has_anilist = np.array([bool(a) for a in anilist])
+        self.average_score = self._numeric(anilist, 'average_score')
+        self.mean_score = self._numeric(anilist, 'mean_score')
+        self.season_year = self._numeric(anilist, 'season_year')
+        self.season = np.array(
+            [SEASONS.index(a['season']) if a.get('season') in SEASONS else -1 for a in anilist],
+            dtype=np.int64
+        )
+
+        # Multi-valued facets are stored as (row, code) pairs plus a label table
+        self.facets = {
+            'genres': self._multi_valued(a.get('genres') for a in anilist),
+            'tags': self._multi_valued(a.get('tags') for a in anilist),
+            'studios': self._multi_valued(a.get('studios') for a in anilist),
+            'content_descriptors': self._multi_valued(m.get('content_descriptors') for m in metadata),
+            'status': self._multi_valued([a['status']] if a.get('status') else [] for a in anilist),
+            'format': self._multi_valued([a['format']] if a.get('format') else [] for a in anilist),
+        }
+
+    @staticmethod
+    def _numeric(records: List[Dict], key: str) -> np.ndarray:
+        return np.array(
+            [record.get(key) if record.get(key) is not None else np.nan for record in records],
+            dtype=np.float64
+        )
+
+    @staticmethod
+    def _multi_valued(values_per_row) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        labels: Dict[str, int] = {}
+        rows = []
+        codes = []
+        for row, values in enumerate(values_per_row):
+            for value in values or []:
+                rows.append(row)
+                codes.append(labels.setdefault(value, len(labels)))
+        return np.array(rows, dtype=np.int64), np.array(codes, dtype=np.int64), list(labels)
+
+
+def facet_frequencies(columns: CatalogColumns, facet: str) -> Dict[str, int]:
+    """Count series per facet value, most frequent first."""
+    _, codes, labels = columns.facets[facet]
+    counts = np.bincount(codes, minlength=len(labels))
+    order = np.argsort(-counts, kind='stable')
+    return {labels[i]: int(counts[i]) for i in order}
+
+
+def distribution(values: np.ndarray, bins: np.ndarray) -> Dict:
+    """
+    Summarize a numeric column over the range covered by bins.
+
+    Missing (NaN) values are ignored. Values outside the bins, such as a 0.0
+    rating on an unrated series, are reported as out_of_range and excluded
+    from count, mean and median so the histogram sums to count.
+    """
+    present = values[~np.isnan(values)]
+    in_range = present[(present >= bins[0]) & (present <= bins[-1])]
+    counts, edges = np.histogram(in_range, bins=bins)
+    return {
+        'count': int(in_range.size),
+        'out_of_range': int(present.size - in_range.size),
+        'mean': round(float(in_range.mean()), 2) if in_range.size else None,
+        'median': round(float(np.median(in_range)), 2) if in_range.size else None,
+        'histogram': [
+            {'min': float(edges[i]), 'max': float(edges[i + 1]), 'count': int(counts[i])}
+            for i in range(len(counts))
+        ],
+    }
+
+
+def studio_stats(columns: CatalogColumns) -> Dict[str, Dict]:
+    """Series count and mean AniList score per studio."""
+    rows, codes, labels = columns.facets['studios']
+    if not labels:
+        return {}
+
+    scores = columns.average_score[rows]
+    scored = ~np.isnan(scores)
+    counts = np.bincount(codes, minlength=len(labels))
+    score_counts = np.bincount(codes[scored], minlength=len(labels))
+    score_sums = np.bincount(codes[scored], weights=scores[scored], minlength=len(labels))
+    mean_scores = np.divide(score_sums, score_counts, out=np.full(len(labels), np.nan),
+                            where=score_counts > 0)
+
+    order = np.argsort(-counts, kind='stable')
+    return {
+        labels[i]: {
+            'count': int(counts[i]),
+            'mean_score': None if np.isnan(mean_scores[i]) else round(float(mean_scores[i]), 1),
+        }
+        for i in order
+    }
+
+
+def season_counts(columns: CatalogColumns) -> Dict[str, int]:
+    """Series count per AniList season, keyed like '2024 FALL', newest first."""
+    valid = ~np.isnan(columns.season_year) & (columns.season >= 0)
+    keys = columns.season_year[valid].astype(np.int64) * len(SEASONS) + columns.season[valid]
+    unique_keys, counts = np.unique(keys, return_counts=True)
+    return {
+        f"{key // len(SEASONS)} {SEASONS[key % len(SEASONS)]}": int(count)
+        for key, count in zip(unique_keys[::-1], counts[::-1])
+    }
+
+
+def coverage_by_year(columns: CatalogColumns) -> Dict[str, Dict[str, int]]:
+    """Total, dubbed and subbed series per Crunchyroll launch year."""
+    valid = ~np.isnan(columns.launch_year)
+    years = columns.launch_year[valid].astype(np.int64)
+    if not years.size:
+        return {}
+
+    offset = years.min()
+    index = years - offset
+    totals = np.bincount(index)
+    dubbed = np.bincount(index, weights=columns.is_dubbed[valid])
+    subbed = np.bincount(index, weights=columns.is_subbed[valid])
+
+    return {
+        str(offset + i): {'total': int(totals[i]), 'dubbed': int(dubbed[i]), 'subbed': int(subbed[i])}
+        for i in np.flatnonzero(totals)
+    }
+
+
+def build_catalog_stats(anime_data: List[Dict]) -> Dict:
+    """Compute the full stats artifact for a catalog."""
+    columns = CatalogColumns(anime_data)
+
+    return {
+        'total': columns.size,
+        'anilist_matched': int(columns.has_anilist.sum()),
+        'dubbed': int(columns.is_dubbed.sum()),
+        'subbed': int(columns.is_subbed.sum()),
+        'mature': int(columns.is_mature.sum()),
+        'facets': {facet: facet_frequencies(columns, facet) for facet in columns.facets},
+        'ratings': distribution(columns.rating, RATING_BINS),
+        'anilist_scores': {
+            'average_score': distribution(columns.average_score, SCORE_BINS),
+            'mean_score': distribution(columns.mean_score, SCORE_BINS),
+        },
+        'studios': studio_stats(columns),
+        'seasons': season_counts(columns),
+        'coverage_by_year': coverage_by_year(columns),
+    }
+
+
+def save_catalog_stats(stats: Dict, filepath: str):
+    """Write the stats artifact as compact JSON."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description='Compute catalog analytics for anime.json.')
+    parser.add_argument('--input', default='frontend/public/anime.json', help='Path to anime.json')
+    parser.add_argument('--output', default='frontend/public/catalog_stats.json', help='Path to write stats')
+    args = parser.parse_args()
+
+    print(f"Loading {args.input}...")
+    with open(args.input, 'r', encoding='utf-8') as f:
+        anime_data = json.load(f)
+
+    start = time.perf_counter()
+    stats = build_catalog_stats(anime_data)
+    elapsed = time.perf_counter() - start
+
+    save_catalog_stats(stats, args.output)
+    print(f"✓ Computed stats for {stats['total']} series in {elapsed * 1000:.0f}ms")
+    print(f"✓ Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
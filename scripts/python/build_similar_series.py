@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build a precomputed "similar series" index from the AniList metadata in anime.json.
+Each matched series becomes a sparse genre/tag/studio/era feature vector and its
+top-k cosine neighbours are computed in blocks with sparse matrix products.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+# Relative weight of each feature group before IDF scaling
+FEATURE_WEIGHTS = {
+    'genre': 1.0,
+    'tag': 1.5,
+    'studio': 0.75,
+    'era': 0.5,
+}
+
+# Launch years are grouped so near-contemporary series share a feature
+ERA_SIZE = 5
+
+
+def extract_features(anime: Dict) -> List[str]:
+    """Return the categorical features of a series, prefixed by feature group."""
+    anilist = anime.get('anilist') or {}
+    features = [f"genre:{genre}" for genre in anilist.get('genres') or []]
+    features += [f"tag:{tag}" for tag in anilist.get('tags') or []]
+    features += [f"studio:{studio}" for studio in anilist.get('studios') or []]
+
+    year = anilist.get('season_year')
+    if year:
+        features.append(f"era:{int(year) // ERA_SIZE * ERA_SIZE}")
+
+    return features
+
+
+def build_feature_matrix(anime_data: List[Dict]) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    Encode every series that has AniList features as a row of a sparse matrix.
+
+    Columns are IDF-weighted so rare tags count for more than ubiquitous genres,
+    and rows are L2-normalized so a dot product is the cosine similarity.
+    """
+    vocabulary: Dict[str, int] = {}
+    ids = []
+    rows = []
+    cols = []
+
+    for anime in anime_data:
+        features = extract_features(anime)
+        if not features:
+            continue
+        row = len(ids)
+        ids.append(anime['id'])
+        for feature in set(features):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(feature, len(vocabulary)))
+
+    if not ids:
+        return sparse.csr_matrix((0, 0), dtype=np.float32), ids
+
+    data = np.ones(len(rows), dtype=np.float32)
+    matrix = sparse.csr_matrix(
+        (data, (np.array(rows), np.array(cols))),
+        shape=(len(ids), len(vocabulary)),
+        dtype=np.float32
+    )
+
+    # Per-column weights: smoothed IDF times the feature group weight
+    document_freq = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(ids)) / (1 + document_freq)) + 1
+    group_weight = np.empty(len(vocabulary), dtype=np.float32)
+    for feature, col in vocabulary.items():
+        group_weight[col] = FEATURE_WEIGHTS[feature.split(':', 1)[0]]
+    matrix = matrix @ sparse.diags((idf * group_weight).astype(np.float32))
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms).astype(np.float32) @ matrix
+
+    return matrix.tocsr(), ids
+
+
+def top_k_neighbours(matrix: sparse.csr_matrix, k: int, block_size: int = 512,
+                     min_score: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the k most similar rows for every row of an L2-normalized matrix.
+
+    Similarities are computed block_size rows at a time, so peak memory is
+    block_size x n_rows instead of n_rows x n_rows. Returns (indices, scores)
+    arrays of shape (n_rows, k); missing neighbours have index -1.
+    """
+    n_rows = matrix.shape[0]
+    k = min(k, max(n_rows - 1, 0))
+    indices = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    matrix_t = matrix.T.tocsc()
+
+    for start in range(0, n_rows, block_size):
+        end = min(start + block_size, n_rows)
+        block = (matrix[start:end] @ matrix_t).toarray()
+
+        # A series is never its own neighbour
+        block[np.arange(end - start), np.arange(start, end)] = -1
+
+        # Unordered top-k per row, then sort just those k by score
+        candidates = np.argpartition(block, -k, axis=1)[:, -k:]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        block_indices = np.take_along_axis(candidates, order, axis=1)
+        block_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        block_indices[block_scores < min_score] = -1
+        indices[start:end] = block_indices
+        scores[start:end] = np.maximum(block_scores, 0)
+
+    return indices, scores
+
+
+def build_similar_series(anime_data: List[Dict], k: int = 8, block_size: int = 512) -> Dict[str, List[str]]:
+    """Return a mapping of series id to the ids of its most similar series."""
+    matrix, ids = build_feature_matrix(anime_data)
+    indices, _ = top_k_neighbours(matrix, k, block_size)
+
+    similar = {}
+    for row, series_id in enumerate(ids):
+        neighbours = [ids[col] for col in indices[row] if col >= 0]
+        if neighbours:
+            similar[series_id] = neighbours
+    return similar
+
+
+def save_similar_series(similar: Dict[str, List[str]], filepath: str):
+    """Write the neighbours artifact as compact JSON."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(similar, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description='Precompute similar series for anime.json.')
+    parser.add_argument('--input', default='frontend/public/anime.json', help='Path to anime.json')
+    parser.add_argument('--output', default='frontend/public/similar.json', help='Path to write neighbours')
+    parser.add_argument('-k', type=int, default=8, help='Neighbours per series')
+    parser.add_argument('--block-size', type=int, default=512, help='Rows per similarity block')
+    args = parser.parse_args()
+
+    print(f"Loading {args.input}...")
+    with open(args.input, 'r', encoding='utf-8') as f:
+        anime_data = json.load(f)
+
+    start = time.perf_counter()
+    similar = build_similar_series(anime_data, args.k, args.block_size)
+    elapsed = time.perf_counter() - start
+
+    save_similar_series(similar, args.output)
+    print(f"✓ Computed neighbours for {len(similar)} series in {elapsed:.2f}s")
+    print(f"✓ Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
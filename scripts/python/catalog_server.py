@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Optional local query service for the published anime catalog.
+Loads anime.json into in-memory indexes and serves the same search, tri-state
+filter and paging semantics as the frontend through a small JSON API.
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlparse
+
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Facets exposed by FilterControls.tsx, keyed by the FilterState field name
+FACET_FIELDS = ['contentDescriptors', 'genres', 'tags', 'status', 'studios']
+BOOLEAN_FIELDS = {
+    'mature': 'is_mature',
+    'dubbed': 'is_dubbed',
+    'subbed': 'is_subbed',
+}
+
+DEFAULT_PER_PAGE = 16
+MAX_PER_PAGE = 128
+MAX_CACHED_WORDS = 10000
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def get_rating(item: Dict, default: float = 0.0) -> float:
+    """
+    Return the average star rating the same way the frontend parses it.
+
+    Unrated series get default. Filtering keeps the frontend's 0.0 so
+    minRating excludes them; catalog stats pass NaN to count them as missing.
+    """
+    rating = item.get('rating')
+    if isinstance(rating, dict):
+        rating = rating.get('average')
+    if not rating:
+        return default
+    try:
+        return float(rating)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_facet_values(item: Dict, facet: str) -> List[str]:
+    """Return the values an item carries for one of the filterable facets."""
+    metadata = item.get('series_metadata') or {}
+    anilist = item.get('anilist') or {}
+
+    if facet == 'contentDescriptors':
+        return metadata.get('content_descriptors') or []
+    if facet == 'status':
+        return [anilist['status']] if anilist.get('status') else []
+    return anilist.get(facet) or []
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache for query results."""
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class CatalogIndex:
+    """Immutable set of in-memory indexes built from one catalog snapshot."""
+
+    def __init__(self, anime_data: List[Dict], loaded_at: float):
+        self.items = anime_data
+        self.loaded_at = loaded_at
+        self.all_ids = set(range(len(anime_data)))
+
+        # Lowercased search text, used to confirm token index candidates
+        self.titles = [(item.get('title') or '').lower() for item in anime_data]
+        self.descriptions = [(item.get('description') or '').lower() for item in anime_data]
+
+        # Facet posting lists: facet -> value -> item positions
+        self.facets: Dict[str, Dict[str, Set[int]]] = {facet: {} for facet in FACET_FIELDS}
+        self.booleans: Dict[str, Set[int]] = {field: set() for field in BOOLEAN_FIELDS}
+        self.tokens: Dict[str, Set[int]] = {}
+
+        ratings = []
+        years = []
+
+        for pos, item in enumerate(anime_data):
+            for facet in FACET_FIELDS:
+                for value in get_facet_values(item, facet):
+                    self.facets[facet].setdefault(value, set()).add(pos)
+
+            metadata = item.get('series_metadata') or {}
+            for field, key in BOOLEAN_FIELDS.items():
+                if metadata.get(key):
+                    self.booleans[field].add(pos)
+
+            for token in set(tokenize(self.titles[pos]) + tokenize(self.descriptions[pos])):
+                self.tokens.setdefault(token, set()).add(pos)
+
+            ratings.append((get_rating(item), pos))
+            year = metadata.get('series_launch_year')
+            if year:
+                years.append((int(year), pos))
+
+        # Sorted arrays for range filters
+        ratings.sort()
+        years.sort()
+        self.rating_keys = [value for value, _ in ratings]
+        self.rating_positions = [pos for _, pos in ratings]
+        self.year_keys = [value for value, _ in years]
+        self.year_positions = [pos for _, pos in years]
+
+        self.vocabulary = sorted(self.tokens)
+        self._word_postings: Dict[str, Set[int]] = {}
+
+    def _positions_for_word(self, word: str) -> Set[int]:
+        """Union the postings of every indexed token containing word."""
+        # Single lookup: another request thread may clear the cache at any time
+        cached = self._word_postings.get(word)
+        if cached is not None:
+            return cached
+        matches = set()
+        for token in self.vocabulary:
+            if word in token:
+                matches |= self.tokens[token]
+        if len(self._word_postings) >= MAX_CACHED_WORDS:
+            self._word_postings.clear()
+        self._word_postings[word] = matches
+        return matches
+
+    def search_candidates(self, search_term: str) -> Set[int]:
+        """
+        Return items whose title or description contains search_term.
+
+        Every word of the search term must be a substring of some indexed
+        token, so the token index narrows the candidates before the exact
+        substring check used by App.tsx.
+        """
+        term = search_term.lower()
+        words = tokenize(term)
+
+        if words:
+            candidates = None
+            for word in sorted(words, key=len, reverse=True):
+                positions = self._positions_for_word(word)
+                candidates = positions if candidates is None else candidates & positions
+                if not candidates:
+                    return set()
+        else:
+            candidates = self.all_ids
+
+        return {
+            pos for pos in candidates
+            if term in self.titles[pos] or term in self.descriptions[pos]
+        }
+
+    def range_positions(self, keys: List, positions: List[int],
+                        low=None, high=None) -> Set[int]:
+        """Return item positions whose sorted key falls within [low, high]."""
+        start = bisect_left(keys, low) if low is not None else 0
+        end = bisect_right(keys, high) if high is not None else len(keys)
+        return set(positions[start:end])
+
+    def query(self, search_term: str, filter_state: Dict) -> List[int]:
+        """Apply search and filters, returning matches in catalog order."""
+        result = self.all_ids
+
+        for field in BOOLEAN_FIELDS:
+            value = filter_state.get(field, 'default')
+            if value == 'include':
+                result = result & self.booleans[field]
+            elif value == 'exclude':
+                result = result - self.booleans[field]
+
+        for facet in FACET_FIELDS:
+            postings = self.facets[facet]
+            for value, state in (filter_state.get(facet) or {}).items():
+                if state == 'include':
+                    result = result & postings.get(value, set())
+                elif state == 'exclude':
+                    result = result - postings.get(value, set())
+
+        min_rating = float(filter_state.get('minRating') or 0)
+        if min_rating > 0:
+            result = result & self.range_positions(
+                self.rating_keys, self.rating_positions, low=min_rating
+            )
+
+        min_year = filter_state.get('minYear')
+        max_year = filter_state.get('maxYear')
+        if min_year is not None or max_year is not None:
+            result = result & self.range_positions(
+                self.year_keys, self.year_positions, low=min_year, high=max_year
+            )
+
+        if search_term and result:
+            result = result & self.search_candidates(search_term)
+
+        return sorted(result)
+
+    def facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """Return per-value item counts for every facet."""
+        counts = {
+            facet: {value: len(positions) for value, positions in sorted(postings.items())}
+            for facet, postings in self.facets.items()
+        }
+        counts.update({field: len(positions) for field, positions in self.booleans.items()})
+        return counts
+
+
+def load_catalog_index(filepath: str) -> CatalogIndex:
+    """Load anime.json and build its indexes."""
+    loaded_at = os.path.getmtime(filepath)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        anime_data = json.load(f)
+    return CatalogIndex(anime_data, loaded_at)
+
+
+def normalize_filter(filter_state: Optional[Dict]) -> Dict:
+    """Drop default entries so equivalent filters share a cache key."""
+    filter_state = filter_state or {}
+    normalized = {}
+
+    for field in BOOLEAN_FIELDS:
+        value = filter_state.get(field, 'default')
+        if value in ('include', 'exclude'):
+            normalized[field] = value
+
+    for facet in FACET_FIELDS:
+        values = {
+            value: state for value, state in (filter_state.get(facet) or {}).items()
+            if state in ('include', 'exclude')
+        }
+        if values:
+            normalized[facet] = dict(sorted(values.items()))
+
+    if float(filter_state.get('minRating') or 0) > 0:
+        normalized['minRating'] = float(filter_state['minRating'])
+    for field in ('minYear', 'maxYear'):
+        if filter_state.get(field) is not None:
+            normalized[field] = parse_year(filter_state[field], field)
+
+    return normalized
+
+
+def parse_year(value, field: str) -> int:
+    """Return value as an integer year, rejecting fractional or non-finite numbers."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{field} must be an integer year")
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{field} must be an integer year")
+    return int(value)
+
+
+class CatalogService:
+    """Owns the current catalog index, the result cache and hot reloading."""
+
+    def __init__(self, catalog_path: str, cache_size: int = 512, reload_interval: float = 5.0):
+        self.catalog_path = catalog_path
+        self.reload_interval = reload_interval
+        self.cache = LRUCache(cache_size)
+        self.index = load_catalog_index(catalog_path)
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def start_watcher(self):
+        """Poll the catalog file and swap in a fresh index when it changes."""
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            self.reload_if_changed()
+
+    def reload_if_changed(self) -> bool:
+        """Rebuild the index if anime.json was republished since the last load."""
+        try:
+            mtime = os.path.getmtime(self.catalog_path)
+            if mtime == self.index.loaded_at:
+                return False
+            new_index = load_catalog_index(self.catalog_path)
+        except (OSError, json.JSONDecodeError) as e:
+            # A half-written file is retried on the next poll
+            print(f"WARNING: Catalog reload failed: {e}")
+            return False
+
+        # Swap the index first so no request can cache a stale result after the clear
+        self.index = new_index
+        self.cache.clear()
+        print(f"✓ Reloaded catalog ({len(new_index.items)} entries)")
+        return True
+
+    def search(self, search_term: str, filter_state: Optional[Dict],
+               page: int = 1, per_page: int = DEFAULT_PER_PAGE) -> bytes:
+        """Run a query and return one page of results as encoded JSON."""
+        index = self.index
+        search_term = search_term or ''
+        filter_state = normalize_filter(filter_state)
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        page = max(1, page)
+
+        key = json.dumps(
+            [index.loaded_at, search_term.lower(), filter_state, page, per_page],
+            sort_keys=True
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        matches = index.query(search_term, filter_state)
+        start = (page - 1) * per_page
+        result = {
+            'total': len(matches),
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (len(matches) + per_page - 1) // per_page,
+            'results': [index.items[pos] for pos in matches[start:start + per_page]],
+        }
+
+        # Cache the encoded body; serialization is the bulk of a repeated query
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self.cache.put(key, body)
+        return body
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """JSON API handler; the service is attached to the server instance."""
+
+    def log_message(self, format, *args):
+        # Per-request logging dominates latency under load
+        pass
+
+    def _send_json(self, payload: Dict, status: int = 200):
+        self._send_body(json.dumps(payload, ensure_ascii=False).encode('utf-8'), status)
+
+    def _send_body(self, body: bytes, status: int = 200):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _search(self, params: Dict):
+        try:
+            body = self.server.service.search(
+                params.get('search', ''),
+                params.get('filter'),
+                page=int(params.get('page', 1)),
+                per_page=int(params.get('per_page', DEFAULT_PER_PAGE)),
+            )
+        except (TypeError, ValueError, AttributeError, OverflowError) as e:
+            self._send_json({'error': f'Invalid query: {e}'}, status=400)
+            return
+        self._send_body(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        service = self.server.service
+
+        if url.path == '/api/search':
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            try:
+                if 'filter' in query:
+                    query['filter'] = json.loads(query['filter'])
+            except json.JSONDecodeError as e:
+                self._send_json({'error': f'Invalid filter JSON: {e}'}, status=400)
+                return
+            self._search(query)
+        elif url.path == '/api/facets':
+            self._send_json(service.index.facet_counts())
+        elif url.path == '/api/health':
+            self._send_json({
+                'entries': len(service.index.items),
+                'loaded_at': service.index.loaded_at,
+                'cache': service.cache.stats(),
+            })
+        else:
+            self._send_json({'error': 'Not found'}, status=404)
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/api/search':
+            self._send_json({'error': 'Not found'}, status=404)
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            self._send_json({'error': f'Invalid JSON body: {e}'}, status=400)
+            return
+        self._search(params)
+
+
+def create_server(service: CatalogService, host: str, port: int) -> ThreadingHTTPServer:
+    """Create an HTTP server bound to the given catalog service."""
+    server = ThreadingHTTPServer((host, port), CatalogRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description='Serve anime.json through an indexed query API.')
+    parser.add_argument('--catalog', default='frontend/public/anime.json', help='Path to anime.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cache-size', type=int, default=512, help='Number of cached query results')
+    parser.add_argument('--reload-interval', type=float, default=5.0,
+                        help='Seconds between checks for a newly published catalog')
+    args = parser.parse_args()
+
+    print(f"Loading catalog from {args.catalog}...")
+    start = time.perf_counter()
+    service = CatalogService(args.catalog, args.cache_size, args.reload_interval)
+    elapsed = time.perf_counter() - start
+    print(f"✓ Indexed {len(service.index.items)} entries in {elapsed * 1000:.0f}ms")
+
+    service.start_watcher()
+    server = create_server(service, args.host, args.port)
+    print(f"✓ Serving on http://{args.host}:{args.port}/api/search")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        service.stop_watcher()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
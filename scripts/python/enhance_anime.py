@@ -9,6 +9,8 @@ import time
 from difflib import SequenceMatcher
 from typing import List, Dict, Optional
 
+from build_catalog_stats import build_catalog_stats
+
 
 def similarity(a: str, b: str) -> float:
     """Calculate similarity between two strings."""
@@ -223,22 +225,14 @@ def enhance_anime_data(input_file: str, output_file: str, batch_size: int = 10):
 
     # Print some statistics
     print("\n=== Statistics ===")
-    genres_count = {}
-    tags_count = {}
-
-    for anime in anime_data:
-        if anime.get('anilist'):
-            for genre in anime['anilist'].get('genres', []):
-                genres_count[genre] = genres_count.get(genre, 0) + 1
-            for tag in anime['anilist'].get('tags', []):
-                tags_count[tag] = tags_count.get(tag, 0) + 1
+    facets = build_catalog_stats(anime_data)['facets']
 
     print(f"\nTop 10 Genres:")
-    for genre, count in sorted(genres_count.items(), key=lambda x: x[1], reverse=True)[:10]:
+    for genre, count in list(facets['genres'].items())[:10]:
         print(f"  {genre}: {count}")
 
     print(f"\nTop 10 Tags:")
-    for tag, count in sorted(tags_count.items(), key=lambda x: x[1], reverse=True)[:10]:
+    for tag, count in list(facets['tags'].items())[:10]:
         print(f"  {tag}: {count}")
 
 
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Declared schemas for Crunchyroll and AniList records, compiled once into fast
+per-record validators. Invalid records are quarantined instead of failing the run.
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+Validator = Callable[[Dict], List[Tuple[str, str]]]
+
+
+def field(types, required: bool = False, nullable: bool = False,
+          items=None, schema: Optional[Dict] = None) -> Dict:
+    """
+    Declare one schema field.
+
+    types: accepted Python type or tuple of types.
+    items: type every list element must have.
+    schema: nested schema for dict values.
+    """
+    return {
+        'types': types if isinstance(types, tuple) else (types,),
+        'required': required,
+        'nullable': nullable,
+        'items': items,
+        'schema': schema,
+    }
+
+
+DATE_SCHEMA = {
+    'year': field(int, nullable=True),
+    'month': field(int, nullable=True),
+    'day': field(int, nullable=True),
+}
+
+SERIES_METADATA_SCHEMA = {
+    'episode_count': field(int, nullable=True),
+    'season_count': field(int, nullable=True),
+    'series_launch_year': field(int, nullable=True),
+    'is_mature': field(bool, nullable=True),
+    'is_dubbed': field(bool, nullable=True),
+    'is_subbed': field(bool, nullable=True),
+    'audio_locales': field(list, nullable=True, items=str),
+    'subtitle_locales': field(list, nullable=True, items=str),
+    'content_descriptors': field(list, nullable=True, items=str),
+    'tenant_categories': field(list, nullable=True, items=str),
+}
+
+CRUNCHYROLL_SCHEMA = {
+    'id': field(str, required=True),
+    'title': field(str, required=True),
+    'type': field(str, required=True),
+    'description': field(str, required=True),
+    'rating': field(dict, nullable=True, schema={
+        'average': field(str, required=True),
+        'total': field(int, nullable=True),
+    }),
+    'series_metadata': field(dict, nullable=True, schema=SERIES_METADATA_SCHEMA),
+    'images': field(dict, nullable=True),
+    'localized': field(dict, nullable=True),
+}
+
+ANILIST_SCHEMA = {
+    'anilist_id': field(int, required=True),
+    'mal_id': field(int, nullable=True),
+    'matched_title': field(str, required=True),
+    'match_score': field((int, float), required=True),
+    'start_date': field(dict, nullable=True, schema=DATE_SCHEMA),
+    'end_date': field(dict, nullable=True, schema=DATE_SCHEMA),
+    'format': field(str, nullable=True),
+    'status': field(str, nullable=True),
+    'episodes': field(int, nullable=True),
+    'duration': field(int, nullable=True),
+    'genres': field(list, required=True, items=str),
+    'tags': field(list, required=True, items=str),
+    'popularity': field(int, nullable=True),
+    'average_score': field(int, nullable=True),
+    'mean_score': field(int, nullable=True),
+    'studios': field(list, required=True, items=str),
+    'season': field(str, nullable=True),
+    'season_year': field(int, nullable=True),
+}
+
+
+def _type_check(types: tuple) -> Callable[[object], bool]:
+    """Build an isinstance check that does not let bools pass as numbers."""
+    if bool in types:
+        return lambda value: isinstance(value, types)
+    return lambda value: isinstance(value, types) and not isinstance(value, bool)
+
+
+def compile_schema(schema: Dict, prefix: str = '') -> Validator:
+    """
+    Compile a declared schema into a single validator function.
+
+    All per-field decisions (type tuples, nested validators, list element
+    checks) are resolved here, so validating a record is a flat loop over
+    prebuilt checks. The validator returns (field_path, reason) pairs.
+    """
+    checks = []
+
+    for name, spec in schema.items():
+        path = f"{prefix}{name}"
+        is_type = _type_check(spec['types'])
+        item_check = _type_check((spec['items'],)) if spec['items'] else None
+        nested = compile_schema(spec['schema'], f"{path}.") if spec['schema'] else None
+        checks.append((name, path, spec['required'], spec['nullable'], is_type, item_check, nested))
+
+    def validate(record: Dict) -> List[Tuple[str, str]]:
+        if not isinstance(record, dict):
+            return [(prefix.rstrip('.') or 'record', 'not an object')]
+        errors = []
+        for name, path, required, nullable, is_type, item_check, nested in checks:
+            if name not in record:
+                if required:
+                    errors.append((path, 'missing'))
+                continue
+
+            value = record[name]
+            if value is None:
+                if required or not nullable:
+                    errors.append((path, 'null'))
+                continue
+            if not is_type(value):
+                errors.append((path, f"type {type(value).__name__}"))
+                continue
+            if item_check and not all(item_check(item) for item in value):
+                errors.append((path, 'item type'))
+            if nested:
+                errors.extend(nested(value))
+        return errors
+
+    return validate
+
+
+validate_crunchyroll_record = compile_schema(CRUNCHYROLL_SCHEMA)
+validate_anilist_record = compile_schema(ANILIST_SCHEMA, 'anilist.')
+
+
+class ValidationReport:
+    """Thread-safe tally of validated and quarantined records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = Counter()
+        self.field_errors = Counter()
+        self.quarantined = []
+
+    def check(self, source: str, record: Dict, validator: Validator,
+              record_id: Optional[str] = None) -> bool:
+        """Validate one record, quarantining it if invalid. Returns True if valid."""
+        errors = validator(record)
+        with self._lock:
+            self.checked[source] += 1
+            if not errors:
+                return True
+            for path, _ in errors:
+                self.field_errors[path] += 1
+            self.quarantined.append({
+                'source': source,
+                'id': record_id,
+                'errors': [f"{path}: {reason}" for path, reason in errors],
+                'record': record,
+            })
+        return False
+
+    def quarantined_count(self, source: str) -> int:
+        with self._lock:
+            return sum(1 for entry in self.quarantined if entry['source'] == source)
+
+    def quarantined_ids(self, source: str) -> List[str]:
+        """Return the distinct ids quarantined from one source, in first-seen order."""
+        with self._lock:
+            return list(dict.fromkeys(
+                entry['id'] for entry in self.quarantined
+                if entry['source'] == source and entry['id'] is not None
+            ))
+
+    def summary(self) -> Dict:
+        """Return per-source totals and per-field error counts for the run report."""
+        with self._lock:
+            return {
+                'checked': dict(self.checked),
+                'quarantined': dict(Counter(entry['source'] for entry in self.quarantined)),
+                'field_errors': dict(self.field_errors.most_common()),
+            }
+
+    def print_summary(self):
+        summary = self.summary()
+        for source, count in summary['checked'].items():
+            print(f"  {source}: {count} checked, {summary['quarantined'].get(source, 0)} quarantined")
+        for path, count in list(summary['field_errors'].items())[:10]:
+            print(f"    {path}: {count}")
+
+    def save_quarantine(self, log_dir: str) -> Optional[str]:
+        """Write quarantined records next to the change logs, if there are any."""
+        if not self.quarantined:
+            return None
+
+        os.makedirs(log_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        quarantine_file = os.path.join(log_dir, f'quarantine_{timestamp}.json')
+
+        with open(quarantine_file, 'w', encoding='utf-8') as f:
+            json.dump(self.quarantined, f, indent=2, ensure_ascii=False)
+
+        print(f"✓ Quarantined records saved to {quarantine_file}")
+        return quarantine_file
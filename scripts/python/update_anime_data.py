@@ -8,11 +8,20 @@ import json
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from difflib import SequenceMatcher
 import requests
 
+from build_catalog_stats import build_catalog_stats, save_catalog_stats
+from build_similar_series import build_similar_series, save_similar_series
+from schema_validation import ValidationReport, validate_anilist_record, validate_crunchyroll_record
+
+
+# An entirely invalid first AniList batch only aborts the run with at least this many matches
+MIN_FAIL_FAST_MATCHES = 5
+
 
 def get_anonymous_token(max_retries: int = 3) -> str:
     """Get an anonymous access token from Crunchyroll with retry logic."""
@@ -242,23 +251,21 @@ def get_anilist_data_batch(titles: List[str]) -> Dict[str, Optional[Dict]]:
     return results
 
 
-def validate_crunchyroll_format(item: Dict) -> bool:
-    """Validate that a Crunchyroll item has the expected format."""
-    required_fields = ['id', 'title', 'type', 'description']
-    return all(field in item for field in required_fields)
+def get_locales() -> List[str]:
+    """Read the catalog locales from CRUNCHYROLL_LOCALES; the first one is primary."""
+    locales = os.getenv('CRUNCHYROLL_LOCALES', 'en-US')
+    return [locale.strip() for locale in locales.split(',') if locale.strip()] or ['en-US']
 
 
-def validate_anilist_format(item: Dict) -> bool:
-    """Validate that an AniList item has the expected format."""
-    if not item:
-        return True  # None is acceptable for no match
-    required_fields = ['anilist_id', 'matched_title', 'match_score']
-    return all(field in item for field in required_fields)
+def fetch_crunchyroll_anime(access_token: str, report: ValidationReport,
+                            locale: str = 'en-US', required: bool = True) -> Optional[List[Dict]]:
+    """
+    Fetch all anime series from Crunchyroll for one locale, quarantining invalid items.
 
-
-def fetch_crunchyroll_anime(access_token: str) -> List[Dict]:
-    """Fetch all anime series from Crunchyroll."""
-    print("Fetching anime catalog from Crunchyroll...")
+    A failed fetch exits the run when required is set; otherwise it is logged
+    and None is returned so the caller can leave the locale out.
+    """
+    print(f"Fetching {locale} anime catalog from Crunchyroll...")
 
     url = "https://www.crunchyroll.com/content/v2/discover/browse"
 
@@ -266,7 +273,7 @@ def fetch_crunchyroll_anime(access_token: str) -> List[Dict]:
         "Authorization": f"Bearer {access_token}",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Language": f"{locale},{locale.split('-')[0]};q=0.9",
         "Accept-Encoding": "gzip, deflate, br",
         "Referer": "https://www.crunchyroll.com/videos/alphabetical",
         "DNT": "1",
@@ -279,7 +286,7 @@ def fetch_crunchyroll_anime(access_token: str) -> List[Dict]:
     params = {
         "n": 2000,  # Fetch up to 2000 items
         "type": "series",
-        "locale": "en-US",
+        "locale": locale,
         "sort_by": "alphabetical",
         "ratings": "true",
         "preferred_audio_language": "ja-JP"
@@ -294,21 +301,168 @@ def fetch_crunchyroll_anime(access_token: str) -> List[Dict]:
         data = response.json()
         items = data.get("data", [])
         total = data.get("total", 0)
-        all_items.extend(items)
 
-        # Validate format of first item
-        if all_items and not validate_crunchyroll_format(all_items[0]):
-            print("ERROR: Crunchyroll API format has changed!")
-            print(f"Expected fields: id, title, type, description")
-            print(f"Received fields: {list(all_items[0].keys())}")
-            sys.exit(1)
+        # Validate every item against the schema; bad records are quarantined
+        for item in items:
+            record_id = item.get('id') if isinstance(item, dict) else None
+            if report.check('crunchyroll', item, validate_crunchyroll_record, record_id):
+                all_items.append(item)
+
+        # Nothing valid at all means the API format changed, not a bad record
+        if items and not all_items:
+            print(f"{'ERROR' if required else 'WARNING'}: Crunchyroll API format has changed!")
+            print(f"All {len(items)} {locale} items failed schema validation")
+            print(f"Received fields: {list(items[0].keys()) if isinstance(items[0], dict) else items[0]}")
+            if required:
+                sys.exit(1)
+            return None
 
-        print(f"✓ Fetched {len(all_items)} of {total} anime series")
+        skipped = len(items) - len(all_items)
+        print(f"✓ Fetched {len(all_items)} of {total} {locale} anime series ({skipped} quarantined)")
         return all_items
 
     except requests.exceptions.RequestException as e:
-        print(f"ERROR: Failed to fetch anime: {e}")
-        sys.exit(1)
+        print(f"{'ERROR' if required else 'WARNING'}: Failed to fetch {locale} anime: {e}")
+        if required:
+            sys.exit(1)
+        return None
+
+
+def merge_locale_catalogs(catalogs: Dict[str, List[Dict]], locales: List[str]) -> List[Dict]:
+    """
+    Merge per-locale catalogs into one record per series id.
+
+    The record from the first locale that lists a series is kept as the base
+    and its locale is recorded in 'base_locale'. The title and description of
+    every other locale that lists the series are stored under 'localized';
+    the base locale's text is only kept at the top level.
+    """
+    merged = {}
+
+    for locale in locales:
+        for item in catalogs[locale]:
+            record = merged.get(item['id'])
+            if record is None:
+                merged[item['id']] = {**item, 'base_locale': locale}
+                continue
+            record.setdefault('localized', {})[locale] = {
+                'title': item.get('title'),
+                'description': item.get('description'),
+            }
+
+    return list(merged.values())
+
+
+def fetch_crunchyroll_catalog(access_token: str, locales: List[str],
+                              report: ValidationReport) -> Tuple[List[Dict], List[str]]:
+    """
+    Fetch every locale concurrently and merge them into one catalog.
+
+    Only the primary (first) locale is required; a secondary locale that fails
+    is left out of the merge. Returns the catalog and the skipped locales.
+    """
+    if len(locales) == 1:
+        return fetch_crunchyroll_anime(access_token, report, locales[0]), []
+
+    def fetch(locale: str) -> Optional[List[Dict]]:
+        return fetch_crunchyroll_anime(access_token, report, locale, required=locale == locales[0])
+
+    with ThreadPoolExecutor(max_workers=len(locales)) as executor:
+        catalogs = dict(zip(locales, executor.map(fetch, locales)))
+
+    skipped = [locale for locale in locales if catalogs[locale] is None]
+    if skipped:
+        print(f"WARNING: Skipping failed locales: {', '.join(skipped)}")
+    fetched = [locale for locale in locales if catalogs[locale] is not None]
+
+    merged = merge_locale_catalogs(catalogs, fetched)
+    foreign_base = sum(1 for record in merged if record['base_locale'] != locales[0])
+    print(f"✓ Merged {sum(len(catalogs[locale]) for locale in fetched)} records "
+          f"from {len(fetched)} locales into {len(merged)} series "
+          f"({foreign_base} not listed in {locales[0]})")
+    return merged, skipped
+
+
+def restore_record(old_item: Dict, surviving: Optional[Dict], locales: List[str]) -> Dict:
+    """
+    Build the record published in place of a quarantined series.
+
+    In a multi-locale catalog the restored record is based on the primary
+    locale, and the localized text of a surviving non-primary copy replaces
+    the previous localized entries.
+    """
+    record = dict(old_item)
+    if len(locales) == 1:
+        return record
+
+    localized = {
+        locale: text for locale, text in (old_item.get('localized') or {}).items()
+        if locale in locales
+    }
+    if surviving is not None:
+        localized.update(surviving.get('localized') or {})
+        localized[surviving['base_locale']] = {
+            'title': surviving.get('title'),
+            'description': surviving.get('description'),
+        }
+    localized.pop(locales[0], None)
+
+    record['base_locale'] = locales[0]
+    record.pop('localized', None)
+    if localized:
+        record['localized'] = localized
+    return record
+
+
+def restore_quarantined_records(new_data: List[Dict], old_data: List[Dict],
+                                quarantined_ids: List[str], locales: List[str]) -> List[str]:
+    """
+    Fall back to the previous good record for quarantined series.
+
+    A series is restored when its new record was quarantined entirely, or when
+    only a non-primary locale copy survived validation. Restored records are
+    placed after the series that preceded them in the previous catalog, so
+    they keep their place in the primary catalog order. Returns restored ids.
+    """
+    primary_locale = locales[0]
+    old_by_id = {item['id']: item for item in old_data}
+    new_by_id = {item['id']: item for item in new_data}
+    restored = {}
+
+    for anime_id in quarantined_ids:
+        old_item = old_by_id.get(anime_id)
+        if old_item is None or validate_crunchyroll_record(old_item):
+            continue
+
+        surviving = new_by_id.get(anime_id)
+        if surviving is not None and surviving.get('base_locale', primary_locale) == primary_locale:
+            continue
+        restored[anime_id] = restore_record(old_item, surviving, locales)
+
+    if not restored:
+        return []
+
+    # Anchor each restored series to the nearest preceding primary-locale series
+    remaining = [item for item in new_data if item['id'] not in restored]
+    anchors = {
+        item['id'] for item in remaining
+        if item.get('base_locale', primary_locale) == primary_locale
+    }
+    anchored = {}
+    anchor = None
+    for item in old_data:
+        if item['id'] in restored:
+            anchored.setdefault(anchor, []).append(restored[item['id']])
+        elif item['id'] in anchors:
+            anchor = item['id']
+
+    ordered = list(anchored.get(None, []))
+    for item in remaining:
+        ordered.append(item)
+        ordered.extend(anchored.get(item['id'], []))
+    new_data[:] = ordered
+
+    return list(restored)
 
 
 def load_previous_data(filepath: str) -> List[Dict]:
@@ -361,7 +515,8 @@ def compare_datasets(old_data: List[Dict], new_data: List[Dict]) -> Dict:
     }
 
 
-def save_change_log(diff: Dict, log_dir: str):
+def save_change_log(diff: Dict, log_dir: str, validation: Optional[Dict] = None,
+                    skipped_locales: Optional[List[str]] = None):
     """Save change log with timestamp."""
     os.makedirs(log_dir, exist_ok=True)
 
@@ -381,6 +536,10 @@ def save_change_log(diff: Dict, log_dir: str):
         'removed': [{'id': item['id'], 'title': item.get('title', 'Unknown')} for item in diff['removed']],
         'status_changes': diff['status_changes']
     }
+    if validation is not None:
+        log_data['validation'] = validation
+    if skipped_locales:
+        log_data['skipped_locales'] = skipped_locales
 
     with open(log_file, 'w', encoding='utf-8') as f:
         json.dump(log_data, f, indent=2, ensure_ascii=False)
@@ -402,48 +561,81 @@ def print_summary(diff_summary: Dict):
     print("="*60 + "\n")
 
 
-def enhance_with_anilist(anime_data: List[Dict], batch_size: int = 10) -> tuple[int, int]:
-    """Enhance anime data with AniList information."""
+def enhance_with_anilist(anime_data: List[Dict], report: ValidationReport,
+                         primary_locale: str = 'en-US', batch_size: int = 10) -> tuple[int, int]:
+    """
+    Enhance anime data with AniList information, quarantining invalid matches.
+
+    Series whose base record is not from the primary locale carry a foreign
+    title that fuzzy-matches poorly, so they are skipped rather than mismatched.
+    """
     print("\nEnhancing with AniList data...")
     print(f"Total anime entries to enhance: {len(anime_data)}")
 
+    matchable = [
+        item for item in anime_data
+        if item.get('base_locale', primary_locale) == primary_locale
+    ]
+    matchable_ids = {item['id'] for item in matchable}
+    skipped_count = len(anime_data) - len(matchable)
+    if skipped_count:
+        print(f"Skipping {skipped_count} entries not listed in {primary_locale}")
+
+    # Query each title once, even if several series ids share it
+    unique_titles = list(dict.fromkeys(item['title'] for item in matchable))
+
     all_results = {}
-    total_batches = (len(anime_data) + batch_size - 1) // batch_size
+    total_matches = 0
+    total_batches = (len(unique_titles) + batch_size - 1) // batch_size
 
-    for i in range(0, len(anime_data), batch_size):
-        batch = anime_data[i:i + batch_size]
-        titles = [item['title'] for item in batch]
+    for i in range(0, len(unique_titles), batch_size):
+        titles = unique_titles[i:i + batch_size]
         batch_num = i // batch_size + 1
 
         progress_pct = (batch_num / total_batches) * 100
         print(f"  Batch {batch_num}/{total_batches} ({progress_pct:.1f}% complete) - Processing {len(titles)} titles...")
         batch_results = get_anilist_data_batch(titles)
+
+        # Validate every match; an invalid match is quarantined and treated as not found
+        matches_in_batch = 0
+        invalid_in_batch = 0
+        for title, result in batch_results.items():
+            if result is None:
+                continue
+            matches_in_batch += 1
+            if not report.check('anilist', result, validate_anilist_record, title):
+                batch_results[title] = None
+                invalid_in_batch += 1
         all_results.update(batch_results)
+        total_matches += matches_in_batch
+
+        # Fail fast: a sizeable, entirely invalid first batch means the API format
+        # changed. Smaller batches are quarantined and left to the end-of-run check.
+        if i == 0 and matches_in_batch >= MIN_FAIL_FAST_MATCHES and invalid_in_batch == matches_in_batch:
+            print("ERROR: AniList API format has changed!")
+            print(f"All {matches_in_batch} AniList matches in the first batch failed schema validation")
+            sys.exit(1)
 
         # Log some successful matches from this batch
-        matches_in_batch = sum(1 for v in batch_results.values() if v is not None)
         print(f"    Found {matches_in_batch}/{len(titles)} AniList matches in this batch")
 
-        # Validate format of first non-None result
-        if i == 0:
-            first_valid_result = next((v for v in batch_results.values() if v is not None), None)
-            if first_valid_result and not validate_anilist_format(first_valid_result):
-                print("ERROR: AniList API format has changed!")
-                print(f"Expected fields: anilist_id, matched_title, match_score")
-                print(f"Received fields: {list(first_valid_result.keys())}")
-                sys.exit(1)
-
         # Rate limiting between batches
-        if i + batch_size < len(anime_data):
+        if i + batch_size < len(unique_titles):
             time.sleep(1.5)  # Be nice to the API
 
+    # Every match failing validation means the API format changed
+    if total_matches and report.quarantined_count('anilist') == total_matches:
+        print("ERROR: AniList API format has changed!")
+        print(f"All {total_matches} AniList matches failed schema validation")
+        sys.exit(1)
+
     # Enhance the anime data
     enhanced_count = 0
     not_found_count = 0
 
     for anime in anime_data:
         title = anime['title']
-        anilist_data = all_results.get(title)
+        anilist_data = all_results.get(title) if anime['id'] in matchable_ids else None
 
         if anilist_data:
             anime['anilist'] = anilist_data
@@ -452,7 +644,7 @@ def enhance_with_anilist(anime_data: List[Dict], batch_size: int = 10) -> tuple[
             anime['anilist'] = None
             not_found_count += 1
 
-    print(f"✓ Enhanced {enhanced_count} entries, {not_found_count} not found")
+    print(f"✓ Enhanced {enhanced_count} entries, {not_found_count} not found ({skipped_count} skipped)")
     return enhanced_count, not_found_count
 
 
@@ -465,40 +657,83 @@ def main():
 
     # Paths
     anime_json_path = 'frontend/public/anime.json'
+    similar_json_path = 'frontend/public/similar.json'
+    stats_json_path = 'frontend/public/catalog_stats.json'
     log_dir = 'data_change_logs'
 
     # Load previous data
-    print("\n[1/6] Loading previous anime data...")
+    print("\n[1/8] Loading previous anime data...")
     old_data = load_previous_data(anime_json_path)
     print(f"✓ Loaded {len(old_data)} previous entries")
 
+    report = ValidationReport()
+
     # Get anonymous token and fetch new data
-    print("\n[2/6] Getting anonymous access token...")
+    print("\n[2/8] Getting anonymous access token...")
     access_token = get_anonymous_token()
 
-    print("\n[3/6] Fetching anime catalog from Crunchyroll...")
-    new_raw_data = fetch_crunchyroll_anime(access_token)
+    locales = get_locales()
+    print(f"\n[3/8] Fetching anime catalog from Crunchyroll ({', '.join(locales)})...")
+    new_raw_data, skipped_locales = fetch_crunchyroll_catalog(access_token, locales, report)
+
+    # Keep publishing the last good version of series that failed validation
+    restored_ids = restore_quarantined_records(
+        new_raw_data, old_data, report.quarantined_ids('crunchyroll'), locales
+    )
+    if restored_ids:
+        print(f"✓ Restored {len(restored_ids)} quarantined series from previous data")
 
     # Enhance new data with AniList
-    print("\n[4/6] Enhancing data with AniList metadata...")
-    enhanced_count, not_found_count = enhance_with_anilist(new_raw_data)
+    print("\n[4/8] Enhancing data with AniList metadata...")
+    enhanced_count, not_found_count = enhance_with_anilist(new_raw_data, report, locales[0])
+
+    print("\nSchema validation:")
+    report.print_summary()
+    report.save_quarantine(log_dir)
 
     # Compare datasets
-    print("\n[5/6] Comparing datasets and generating change log...")
+    print("\n[5/8] Comparing datasets and generating change log...")
     diff = compare_datasets(old_data, new_raw_data)
 
+    # Series that failed validation are reported as quarantined, not removed
+    quarantined_ids = report.quarantined_ids('crunchyroll')
+    quarantined_set = set(quarantined_ids)
+    diff['removed'] = [item for item in diff['removed'] if item['id'] not in quarantined_set]
+
+    # Quarantined series with no restored record and no surviving copy are unpublished
+    published_ids = {item['id'] for item in new_raw_data}
+    quarantined_unpublished = [
+        anime_id for anime_id in quarantined_ids
+        if anime_id not in restored_ids and anime_id not in published_ids
+    ]
+
     # Save change log
-    log_data = save_change_log(diff, log_dir)
+    validation = report.summary()
+    validation['restored_from_previous'] = restored_ids
+    validation['quarantined_unpublished'] = quarantined_unpublished
+    log_data = save_change_log(diff, log_dir, validation, skipped_locales)
 
     # Print summary
     print_summary(log_data['summary'])
 
     # Save new data
-    print(f"[6/6] Saving new data to {anime_json_path}...")
+    print(f"[6/8] Saving new data to {anime_json_path}...")
     with open(anime_json_path, 'w', encoding='utf-8') as f:
         json.dump(new_raw_data, f, indent=2, ensure_ascii=False)
     print("✓ Data saved successfully")
 
+    # Precompute similar series for the frontend
+    print(f"\n[7/8] Building similar series index at {similar_json_path}...")
+    similar = build_similar_series(new_raw_data)
+    save_similar_series(similar, similar_json_path)
+    print(f"✓ Saved neighbours for {len(similar)} series")
+
+    # Aggregate catalog analytics for facet counts and charts
+    print(f"\n[8/8] Computing catalog stats at {stats_json_path}...")
+    stats = build_catalog_stats(new_raw_data)
+    save_catalog_stats(stats, stats_json_path)
+    print(f"✓ Saved stats for {stats['total']} series")
+
     print("\n" + "="*70)
     print(f"UPDATE COMPLETED at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
@@ -511,6 +746,8 @@ def main():
             f.write(f"status_changes={log_data['summary']['status_changes_count']}\n")
             f.write(f"enhanced={enhanced_count}\n")
             f.write(f"not_found={not_found_count}\n")
+            f.write(f"quarantined={len(report.quarantined)}\n")
+            f.write(f"skipped_locales={','.join(skipped_locales)}\n")
 
 
 if __name__ == '__main__':
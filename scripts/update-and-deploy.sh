@@ -43,7 +43,7 @@ if ! git diff --quiet frontend/public/anime.json; then
     log "Changes detected, creating commit..."
 
     # Stage changes
-    git add frontend/public/anime.json data_change_logs/
+    git add frontend/public/anime.json frontend/public/similar.json frontend/public/catalog_stats.json data_change_logs/
 
     # Create commit message
     COMMIT_MSG="Automated anime data update - $(date '+%Y-%m-%d')